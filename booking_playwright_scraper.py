@@ -1,20 +1,23 @@
-"""Standalone Playwright-based Booking.com scraper.
+"""Playwright-based Booking.com scraper.
 
-This script is invoked by the ADK tool `get_booking_com_data` via
-subprocess. It prints a single JSON object to stdout.
+The ADK tool `get_booking_com_data` imports and awaits
+`scrape_booking_hotel_async` directly. Running the module as a script is
+kept as a CLI fallback that prints a single JSON object to stdout.
 """
 
 import asyncio
 import json
+import os
 import re
 import sys
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 from urllib.parse import urlparse, urlunparse
 
 
+@lru_cache(maxsize=1024)
 def canonicalize_booking_url(raw_url: str) -> Optional[str]:
     """Normalize Booking.com hotel URLs so the same hotel maps to one key."""
     if not raw_url:
@@ -29,6 +32,7 @@ def canonicalize_booking_url(raw_url: str) -> Optional[str]:
     return urlunparse(("https", host, path, "", "", ""))
 
 
+@lru_cache(maxsize=1024)
 def update_url_language(url: str, language: str) -> str:
     """Adjust Booking.com URL language segment, if present."""
     language = (language or "en").lower()
@@ -39,86 +43,263 @@ def update_url_language(url: str, language: str) -> str:
     return url
 
 
+# Resource types we never need: we only read DOM structure and img `src`
+# attributes, so the image/font/media bytes themselves are wasted transfer.
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+
+# Booking hotel photos all live under this CDN path, so a single linear
+# regex scan of the raw HTML can recover them even when the gallery UI
+# refuses to cooperate.
+_BSTATIC_RE = re.compile(
+    r"https?://[^\"'\s>]*cf\.bstatic\.com/xdata/images/hotel[^\"'\s>]*"
+)
+
+# Selectors and patterns the scraper evaluates on every run, hoisted so
+# they are defined (and the regex compiled) exactly once.
+_SEL_PHOTO_GRID = "div.nha_large_photo_main_content"
+_SEL_GALLERY_THUMB = "div[data-testid='gallery-modal-grid'] div"
+_SEL_GALLERY_COUNTER = "div[data-testid='gallery-single-view-counter-text']"
+_SEL_GALLERY_IMG = "div[data-testid='gallery-single-view'] picture img"
+_SEL_ALL_PICTURES = "div[data-testid='gallery-modal-grid'] picture img, picture img"
+_SEL_HOTEL_NAME = "h2.pp-header__title"
+_SEL_DESCRIPTION = "p[data-testid='property-description']"
+_COUNTER_RE = re.compile(r"/\s*(\d+)")
+
+# Booking serves the same photo at many sizes (/max300/, /square60/,
+# /max1024x768/, ...), so galleries are full of near-duplicates. A
+# photo's identity is its CDN path with the size segment stripped.
+_SIZE_SEGMENT_RE = re.compile(r"/(?:max|square)[^/]*/")
+
+# Every extra URL costs a Vision call and caption tokens downstream.
+MAX_HOTEL_IMAGES = int(os.getenv("MAX_HOTEL_IMAGES", "10"))
+
+
+def _dedupe_and_cap_image_urls(urls: List[str]) -> List[str]:
+    """Keep one URL per distinct photo, capped at MAX_HOTEL_IMAGES.
+
+    The first URL seen per identity wins, which in gallery order is the
+    variant Booking itself leads with.
+    """
+    by_identity: Dict[str, str] = {}
+    for url in urls:
+        identity = _SIZE_SEGMENT_RE.sub("/", urlparse(url).path)
+        by_identity.setdefault(identity, url)
+    return list(by_identity.values())[:MAX_HOTEL_IMAGES]
+
+
+# Persistent profile directory: reusing a warm profile skips Chromium's
+# first-run initialization (IndexedDB, cache, cookies) on every launch,
+# and a profile with persisted cookies draws fewer Booking.com bot
+# challenges on repeat scrapes. The default is per-process because
+# Chromium's SingletonLock allows only one running browser per
+# user-data dir — with a fixed path, every uvicorn worker after the
+# first would fail to launch. Set PW_USER_DATA_DIR to share a profile
+# across restarts when running a single worker.
+USER_DATA_DIR = os.getenv("PW_USER_DATA_DIR", f"/tmp/pw-profile-{os.getpid()}")
+
+# Module-level singleton: Chromium launch costs ~1-2s and ~200MB RSS, so
+# repeated scrapes share one persistent BrowserContext and only open a
+# fresh (cheap) page each.
+_playwright = None
+_context = None
+_browser_lock = asyncio.Lock()
+
+
+async def get_browser_context():
+    """Return the shared persistent context, launching it on first use."""
+    global _playwright, _context
+    async with _browser_lock:
+        if _context is None:
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _context = await _playwright.chromium.launch_persistent_context(
+                user_data_dir=USER_DATA_DIR,
+                headless=True,
+                args=["--disable-blink-features=AutomationControlled"],
+            )
+    return _context
+
+
+async def _reset_context() -> None:
+    """Drop a dead shared context so the next call relaunches."""
+    global _context
+    async with _browser_lock:
+        if _context is not None:
+            try:
+                await _context.close()
+            except Exception:  # noqa: BLE001 - it's already dead
+                pass
+            _context = None
+
+
+async def new_scraper_page():
+    """Open a page on the shared context, relaunching once if it died.
+
+    If Chromium crashed (OOM kill, etc.) since the last scrape, the
+    stale singleton would otherwise fail every subsequent call with
+    "browser has been closed".
+    """
+    context = await get_browser_context()
+    try:
+        return await context.new_page()
+    except Exception as e:  # noqa: BLE001
+        print(f"⚠️ Shared browser unusable ({e}); relaunching", file=sys.stderr)
+        await _reset_context()
+        context = await get_browser_context()
+        return await context.new_page()
+
+
+async def close_browser() -> None:
+    """Shut down the shared context (CLI / process-exit cleanup)."""
+    global _playwright, _context
+    async with _browser_lock:
+        if _context is not None:
+            await _context.close()
+            _context = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
+
+async def _block_nonessential(route) -> None:
+    """Abort requests for resources the scraper never looks at."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _click_through_gallery(
+    page, total_images: int, initial_urls: List[str]
+) -> List[str]:
+    """Advance the single-image gallery view, collecting each src.
+
+    Slow path: one click per image, polling until the src changes instead
+    of sleeping a fixed second.
+    """
+    collected = list(initial_urls)
+    try:
+        prev_src: Optional[str] = None
+        for i in range(total_images):
+            src = None
+            deadline = asyncio.get_event_loop().time() + 3.0
+            while asyncio.get_event_loop().time() < deadline:
+                img = await page.query_selector(_SEL_GALLERY_IMG)
+                src = await img.get_attribute("src") if img else None
+                if src and src != prev_src:
+                    break
+                await asyncio.sleep(0.1)
+
+            if src and src != prev_src:
+                collected.append(src)
+                print(f"✅ {i+1}/{total_images} - {src}", file=sys.stderr)
+
+            prev_src = src
+            await page.mouse.click(640, 360)
+    except Exception as e:  # noqa: BLE001
+        print(f"⚠️ Gallery navigation failed: {e}", file=sys.stderr)
+
+    # Order-preserving dedup in one C-level pass instead of a per-iteration
+    # set membership check on full URL strings.
+    return list(dict.fromkeys(collected))
+
+
 async def scrape_booking_hotel_async(url: str, language: str = "en") -> Dict[str, Any]:
-    """Core scraper logic using Playwright + BeautifulSoup."""
+    """Core scraper logic using Playwright."""
     url = update_url_language(url, language)
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url)
-        await page.wait_for_timeout(5000)
+    page = await new_scraper_page()
+    try:
+        await page.route("**/*", _block_nonessential)
+        await page.goto(url, wait_until="domcontentloaded")
         final_url = page.url
 
-        # Step 1: Open image thumbnails grid.
+        # Step 1: Open image thumbnails grid. Instead of a fixed sleep we
+        # wait for the next step's selector to actually become visible.
         try:
-            await page.locator("div.nha_large_photo_main_content").first.click()
-            await page.wait_for_timeout(3000)
+            await page.locator(_SEL_PHOTO_GRID).first.click()
+            await page.locator(_SEL_GALLERY_THUMB).first.wait_for(
+                state="visible", timeout=10000
+            )
         except Exception as e:  # noqa: BLE001
             print(f"⚠️ Step 1 failed: {e}", file=sys.stderr)
 
         # Step 2: Open full gallery by clicking a thumbnail.
         try:
-            await page.locator("div[data-testid='gallery-modal-grid'] div").first.click()
-            await page.wait_for_timeout(3000)
+            await page.locator(_SEL_GALLERY_THUMB).first.click()
+            await page.locator(_SEL_GALLERY_COUNTER).first.wait_for(
+                state="visible", timeout=10000
+            )
         except Exception as e:  # noqa: BLE001
             print(f"⚠️ Step 2 failed: {e}", file=sys.stderr)
 
         # Step 3: Extract total image count from gallery counter.
         try:
-            counter_text = await page.inner_text(
-                "div[data-testid='gallery-single-view-counter-text'] div"
-            )
-            match = re.search(r"/\\s*(\\d+)", counter_text)
+            counter_text = await page.inner_text(f"{_SEL_GALLERY_COUNTER} div")
+            match = _COUNTER_RE.search(counter_text)
             total_images = int(match.group(1)) if match else 50
             print(f" Total images detected: {total_images}", file=sys.stderr)
         except Exception as e:  # noqa: BLE001
             print(f"⚠️ Could not detect image count, using fallback (50): {e}", file=sys.stderr)
             total_images = 50
 
-        # Step 4: Extract all image URLs.
+        # Step 4: Extract all image URLs in a single DOM pass. The gallery
+        # markup already carries every <picture> src, so one
+        # eval_on_selector_all replaces total_images click-advance cycles.
         image_urls: List[str] = []
-        seen: set[str] = set()
         try:
-            for i in range(total_images):
-                img = await page.query_selector(
-                    "div[data-testid='gallery-single-view'] picture img"
-                )
-                if img:
-                    src = await img.get_attribute("src")
-                    if src and src not in seen:
-                        seen.add(src)
-                        image_urls.append(src)
-                        print(f"✅ {i+1}/{total_images} - {src}", file=sys.stderr)
-
-                await page.mouse.click(640, 360)
-                await page.wait_for_timeout(1000)
+            image_urls = await page.eval_on_selector_all(
+                _SEL_ALL_PICTURES,
+                "els => Array.from(new Set(els.map(e => e.currentSrc || e.src"
+                " || e.getAttribute('data-highres')"
+                " || e.getAttribute('data-src')).filter(Boolean)))",
+            )
+            print(
+                f"✅ Extracted {len(image_urls)}/{total_images} image URLs in one pass",
+                file=sys.stderr,
+            )
         except Exception as e:  # noqa: BLE001
-            print(f"⚠️ Gallery navigation failed: {e}", file=sys.stderr)
+            print(f"⚠️ One-pass gallery extraction failed: {e}", file=sys.stderr)
 
-        # Scrape hotel name and description.
-        html = await page.content()
-        await browser.close()
+        # Fallback: click through the gallery the old way if the one-shot
+        # extraction came up short (e.g. lazily attached <picture> nodes).
+        if len(image_urls) < total_images:
+            image_urls = await _click_through_gallery(page, total_images, image_urls)
 
-    soup = BeautifulSoup(html, "html.parser")
+        # Last resort: scan the raw HTML for CDN photo URLs — one regex
+        # pass in C, no DOM traversal at all.
+        if not image_urls:
+            html = await page.content()
+            image_urls = list(dict.fromkeys(_BSTATIC_RE.findall(html)))
+            print(
+                f"ℹ️ Regex fallback recovered {len(image_urls)} image URLs",
+                file=sys.stderr,
+            )
 
-    try:
-        hotel_name_el = soup.select_one("h2.pp-header__title")
-        hotel_name = hotel_name_el.get_text(strip=True) if hotel_name_el else "Not found"
-    except Exception:  # noqa: BLE001
-        hotel_name = "Not found"
+        # Scrape hotel name and description straight from the live DOM —
+        # Playwright already has it parsed, so there is no reason to
+        # serialize ~500KB of HTML and rebuild a soup tree for two fields.
+        try:
+            hotel_name = (
+                await page.locator(_SEL_HOTEL_NAME).first.inner_text(timeout=5000)
+            ).strip() or "Not found"
+        except Exception:  # noqa: BLE001
+            hotel_name = "Not found"
 
-    try:
-        desc_el = soup.select_one("p[data-testid='property-description']")
-        description = desc_el.get_text(strip=True) if desc_el else "Not found"
-    except Exception:  # noqa: BLE001
-        description = "Not found"
+        try:
+            description = (
+                await page.locator(_SEL_DESCRIPTION).first.inner_text(timeout=5000)
+            ).strip() or "Not found"
+        except Exception:  # noqa: BLE001
+            description = "Not found"
+    finally:
+        await page.close()
 
     return {
         "status": "success",
         "hotel_name": hotel_name,
         "description": description,
-        "image_urls": image_urls,
+        "image_urls": _dedupe_and_cap_image_urls(image_urls),
         "booking_url": final_url,
         "booking_url_canon": canonicalize_booking_url(final_url),
     }
@@ -144,8 +325,14 @@ def main() -> None:
     url = sys.argv[1]
     language = sys.argv[2] if len(sys.argv) > 2 else "en"
 
+    async def _run() -> Dict[str, Any]:
+        try:
+            return await scrape_booking_hotel_async(url, language)
+        finally:
+            await close_browser()
+
     try:
-        result = asyncio.run(scrape_booking_hotel_async(url, language))
+        result = asyncio.run(_run())
     except Exception as e:  # noqa: BLE001
         print(
             json.dumps(
@@ -1,8 +1,17 @@
 import os
 import sys
 import asyncio
+import functools
 import logging
 import json
+import re
+
+# orjson (C-optimized) is optional; fall back to stdlib json if missing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from dotenv import load_dotenv
 
@@ -38,8 +47,13 @@ except ImportError as e:
 
 
 # --- 2. Configure Observability ---
+@functools.cache
 def setup_observability() -> None:
-    """Configures logging and tracing based on environment."""
+    """Configures logging and tracing based on environment.
+
+    Cached so repeat calls (e.g. from another entry point importing this
+    module) cannot attach a second CloudLoggingHandler or span processor.
+    """
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
@@ -86,8 +100,11 @@ setup_observability()
 
 
 # --- 3. Configure the ADK Application ---
+# Compact at most once per full pipeline pass: compaction is itself an
+# LLM call, and an interval of 2 was firing it twice mid-run purely for
+# summarization. Sized from the pipeline so adding stages keeps this true.
 compaction_config = EventsCompactionConfig(
-    compaction_interval=2,
+    compaction_interval=max(len(root_agent.sub_agents), 4),
     overlap_size=1,
 )
 
@@ -106,19 +123,60 @@ db_path = (
     if os.environ.get("GOOGLE_CLOUD_PROJECT")
     else "sessions.db"
 )
-db_url = f"sqlite:///{db_path}"
+# Prefer the async aiosqlite driver: the default synchronous sqlite
+# driver blocks the event loop for the duration of each fsync on every
+# create_session/get_session call. If the installed ADK version rejects
+# the async URL, fall back to the sync driver, then to in-memory.
+session_service = None
+for db_url in (f"sqlite+aiosqlite:///{db_path}", f"sqlite:///{db_path}"):
+    try:
+        logging.info("Initializing DatabaseSessionService with URL %s", db_url)
+        session_service = DatabaseSessionService(db_url=db_url)
+        break
+    except Exception as e:
+        logging.warning(
+            "Failed to initialize DatabaseSessionService with %s (%s).",
+            db_url,
+            e,
+        )
 
-try:
-    logging.info("Initializing DatabaseSessionService with URL %s", db_url)
-    session_service = DatabaseSessionService(db_url=db_url)
-except Exception as e:
-    logging.warning(
-        "Failed to initialize DatabaseSessionService (%s). "
-        "Falling back to InMemorySessionService.",
-        e,
-    )
+if session_service is None:
+    logging.warning("Falling back to InMemorySessionService.")
     session_service = InMemorySessionService()
 
+
+def _tune_sqlite_session_db(service) -> None:
+    """Apply SQLite PRAGMAs (WAL, relaxed fsync) to the session engine.
+
+    The session DB is ephemeral (/tmp on Cloud Run), so the default
+    journal_mode=DELETE / synchronous=FULL pair forces two fsyncs per
+    commit for durability we don't need. Best-effort: skips quietly if
+    this ADK version doesn't expose the underlying engine.
+    """
+    try:
+        from sqlalchemy import event
+
+        engine = getattr(service, "db_engine", None) or getattr(service, "_engine", None)
+        if engine is None:
+            return
+        # Async engines (aiosqlite) wrap a sync engine that owns the pool events.
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=NORMAL")
+            cur.execute("PRAGMA temp_store=MEMORY")
+            cur.execute("PRAGMA mmap_size=268435456")
+            cur.close()
+    except Exception as e:
+        logging.warning("Could not apply SQLite PRAGMA tuning: %s", e)
+
+
+if isinstance(session_service, DatabaseSessionService):
+    _tune_sqlite_session_db(session_service)
+
 runner = Runner(
     app=social_media_app,
     session_service=session_service,
@@ -126,6 +184,25 @@ runner = Runner(
 
 
 # --- Helpers ---
+# Precompiled once: strips ```json fences and slices out the JSON array,
+# replacing the per-call splitlines/find/rfind scans.
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+_JSON_SLICE_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+
+def _extract_json(content: str) -> str:
+    """Strip markdown fences and grab the first JSON-array-like chunk."""
+    m = _FENCE_RE.match(content)
+    if m:
+        content = m.group(1)
+    m = _JSON_SLICE_RE.search(content)
+    return m.group(0) if m else content
+
+
+def _json_loads(content: str):
+    return orjson.loads(content) if HAS_ORJSON else json.loads(content)
+
+
 def _normalize_final_posts(final_posts):
     """Convert model output into a Python list for API consumption."""
     if final_posts is None:
@@ -145,24 +222,11 @@ def _normalize_final_posts(final_posts):
         return normalized or None
 
     if isinstance(final_posts, str):
-        content = final_posts.strip()
-
-        # Strip common ```json fences if present
-        if content.startswith("```"):
-            lines = content.splitlines()
-            if lines and lines[0].startswith("```"):
-                lines = lines[1:]
-            if lines and lines[-1].startswith("```"):
-                lines = lines[:-1]
-            content = "\n".join(lines).strip()
-
-        # Fallback: if we still have junk around, grab the first JSON-like chunk
-        if "[" in content and "]" in content:
-            content = content[content.find("[") : content.rfind("]") + 1]
+        content = _extract_json(final_posts.strip())
 
         try:
-            parsed = json.loads(content)
-        except json.JSONDecodeError as e:
+            parsed = _json_loads(content)
+        except ValueError as e:
             logging.error("Failed to parse final_posts JSON: %s", e)
             return None
 
@@ -184,7 +248,14 @@ def _normalize_final_posts(final_posts):
 
 # --- 5. Main Pipeline Execution ---
 async def run_pipeline(booking_url: str, website_url: str | None = None) -> dict:
-    """Runs the full social media content generation pipeline."""
+    """Runs the full social media content generation pipeline.
+
+    This is a coroutine: async callers (e.g. the FastAPI server) should
+    await it directly. Synchronous callers should use
+    `run_pipeline_sync`, which reuses one long-lived event loop instead
+    of paying loop setup/teardown (and losing the warm Playwright
+    browser) on every call.
+    """
     # Generate a unique session ID
     session_id = f"session_{os.urandom(8).hex()}"
     user_id = "rapidbounce_user"
@@ -249,10 +320,24 @@ async def run_pipeline(booking_url: str, website_url: str | None = None) -> dict
         return {"status": "error", "message": str(e)}
 
 
+# Long-lived loop for synchronous callers: asyncio.run per call would
+# tear down transports (including the shared Playwright browser) between
+# pipeline runs.
+_sync_loop: asyncio.AbstractEventLoop | None = None
+
+
+def run_pipeline_sync(booking_url: str, website_url: str | None = None) -> dict:
+    """Blocking wrapper around `run_pipeline` for non-async callers."""
+    global _sync_loop
+    if _sync_loop is None or _sync_loop.is_closed():
+        _sync_loop = asyncio.new_event_loop()
+    return _sync_loop.run_until_complete(run_pipeline(booking_url, website_url))
+
+
 if __name__ == "__main__":
     # Simple test for running main.py directly
     TEST_URL = "https://www.booking.com/hotel/gr/test-hotel.html"
     if "test-hotel" in TEST_URL:
         print("Update the TEST_URL in main.py to test directly.")
     else:
-        asyncio.run(run_pipeline(TEST_URL))
+        run_pipeline_sync(TEST_URL)
@@ -1,9 +1,7 @@
 from google.adk.agents import SequentialAgent
 
-from .subagents.booking_scraper_agent import booking_scraper_agent
-from .subagents.website_scraper_agent import website_scraper_agent
-from .subagents.image_analysis_agent import image_analysis_agent
-from .subagents.social_media_agent import social_media_agent
+from .subagents.content_ingestion_agent import content_ingestion_agent
+from .subagents.analysis_and_posts_agent import analysis_and_posts_agent
 
 # --- Define a Local Subclass ---
 # subclass SequentialAgent so the ADK Runner recognizes this agent
@@ -12,13 +10,13 @@ class SocialMediaPipeline(SequentialAgent):
     pass
 
 # --- 1. Define the Root Agent (The Pipeline) ---
-# Use the local class instead of SequentialAgent directly
+# Ingestion calls the booking scraper as a plain function tool (no LLM
+# wrapper) and dispatches the website search in the same turn, so the
+# whole pipeline is down to two LLM stages.
 root_agent = SocialMediaPipeline(
     name="Social_Media_Pipeline_Agent",
     sub_agents=[
-        booking_scraper_agent,   # Step 1: Get booking_data
-        website_scraper_agent,   # Step 2: Get website_data
-        image_analysis_agent,    # Step 3: Analyze images
-        social_media_agent,      # Step 4: Write posts
+        content_ingestion_agent,   # Step 1: Scrape + merge -> ingested_content
+        analysis_and_posts_agent,  # Step 2: Analyze images + write posts
     ],
 )
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""Shared configuration for the main_agent package."""
+
+from google.genai import types
+
+# One retry policy for every agent. The old per-module value
+# (exp_base=7) backed off 7 + 49 + 343 + 2401 seconds in the worst case,
+# turning a transient 429 into a ~47-minute hang. Standard base-2
+# exponential backoff capped at 30s keeps the same retry protection with
+# bounded tail latency.
+retry_config = types.HttpRetryOptions(
+    attempts=5,
+    exp_base=2,
+    initial_delay=1.0,
+    max_delay=30.0,
+)
@@ -1,7 +1,5 @@
 from . import (
-    booking_scraper_agent,
+    analysis_and_posts_agent,
     content_ingestion_agent,
-    image_analysis_agent,
-    social_media_agent,
     website_scraper_agent,
 )
@@ -0,0 +1 @@
+from .agent import analysis_and_posts_agent
@@ -0,0 +1,51 @@
+from google.adk.agents import LlmAgent
+from google.adk.models.google_llm import Gemini
+
+from ...config import retry_config
+from ...tools.tools import analyze_images_with_vision
+
+
+# --- Define the Agent ---
+# Fuses the old Image_Analysis_Agent and Social_Media_Agent into one
+# LLM turn: one batched Vision tool call, then the final posts in the
+# same decode. This saves a full prefill+decode round per pipeline run.
+analysis_and_posts_agent = LlmAgent(
+    model=Gemini(model="gemini-2.5-flash-lite", retry_options=retry_config),
+    name="Analysis_And_Posts_Agent",
+    description="Analyzes hotel images with Vision and writes the final social media posts in one step.",
+
+    instruction="""
+    You are a world-class social media marketer for the tourism industry.
+    Your job is to analyze a hotel's images and write compelling posts for them, in one pass.
+
+    The previous step has already gathered the hotel's content and stored it in the `ingested_content` state variable:
+
+        {
+          "description": "<text>",
+          "image_urls": ["<url1>", "<url2>", ...]
+        }
+
+    Your task:
+    1.  You **MUST** call the `analyze_images_with_vision` tool **exactly once**, passing the **entire** `ingested_content.image_urls` list. The tool analyzes all images concurrently and returns a JSON list of objects, one per input URL, each with `"image_url"` and `"tags"` (images that could not be analyzed come back with `"tags": []` — keep them).
+    2.  Immediately after the tool returns, write the posts — do **not** make any further tool calls. For **each image** in the tool result, generate:
+        a.  A **compelling caption** (2-3 sentences). This caption must be unique and inspired by that image's specific `tags` (e.g., if tags include "swimming pool", write about relaxation by the pool), while remaining consistent with the hotel's tone from `ingested_content.description`.
+        b.  A list of 3-5 relevant **hashtags** (e.g., #HotelPool, #LuxuryTravel).
+    3.  Your final response **MUST** be a single JSON list, formatted exactly like this:
+        [
+            { "image_url": "url1.jpg", "caption": "Your amazing caption here...", "hashtags": ["#tag1", "#tag2"] },
+            { "image_url": "url2.jpg", "caption": "Another unique caption...", "hashtags": ["#tag3", "#tag4"] }
+        ]
+
+    Important constraints:
+    - Do **not** apologize or say that you encountered an error in your final answer.
+    - Do **not** add any extra commentary outside the JSON list.
+    """,
+
+    tools=[
+        analyze_images_with_vision  # From tools.py
+    ],
+
+    # --- Define Output State ---
+    # This is the final output of the entire pipeline
+    output_key="final_posts"
+)
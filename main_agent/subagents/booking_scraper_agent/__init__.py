@@ -1 +0,0 @@
-from .agent import booking_scraper_agent
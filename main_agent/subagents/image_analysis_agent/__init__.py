@@ -1 +0,0 @@
-from .agent import image_analysis_agent
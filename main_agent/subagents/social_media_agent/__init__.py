@@ -1 +0,0 @@
-from .agent import social_media_agent  
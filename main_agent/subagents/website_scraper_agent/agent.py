@@ -1,10 +1,10 @@
 from google.adk.agents import LlmAgent
 from google.adk.models.google_llm import Gemini
+
 from google.adk.tools import google_search
-from google.genai import types
 
-# Configure Retry Options
-retry_config = types.HttpRetryOptions(attempts=5, exp_base=7)
+from ...config import retry_config
+
 
 # --- Define the Agent ---
 website_scraper_agent = LlmAgent(
@@ -1,24 +1,48 @@
-import json
+import asyncio
+import hashlib
+import logging
 import os
-import subprocess
 import sys
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional
 
 import requests
 from google.cloud import vision
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# diskcache is optional: it persists Vision results across processes,
+# which pays off when the same hotel is re-run during development.
+# Without it we fall back to a process-local dict.
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
 
-# --- Booking.com Scraper (Playwright via subprocess) ---
+logger = logging.getLogger(__name__)
 
-def get_booking_com_data(booking_url: str, language: str = "en") -> Dict[str, Any]:
+# The scraper module lives at the project root, two levels above this
+# package, so make sure that directory is importable.
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from booking_playwright_scraper import scrape_booking_hotel_async
+
+
+# --- Booking.com Scraper (Playwright, in-process) ---
+
+async def get_booking_com_data(booking_url: str, language: str = "en") -> Dict[str, Any]:
     """
     Scrapes a Booking.com hotel URL for its main description and image URLs.
 
-    This implementation delegates to an external Playwright-based script
-    (`booking_playwright_scraper.py`) run in a separate process so that
-    the ADK event loop does not need to manage browser subprocesses.
+    The Playwright scraper now runs in-process: we await
+    `scrape_booking_hotel_async` directly instead of forking a Python
+    subprocess per call, which skips interpreter startup and stdout JSON
+    plumbing and lets repeated scrapes reuse the shared browser.
 
-    The script is expected to print a single JSON object to stdout:
+    Returns a dict of the shape:
         {
             "status": "success" | "error",
             "hotel_name": "...",
@@ -29,60 +53,13 @@ def get_booking_com_data(booking_url: str, language: str = "en") -> Dict[str, An
             "message": "optional error/info message"
         }
     """
-    print(f"--- Calling Tool: get_booking_com_data for {booking_url} ---")
-
-    # Resolve the scraper script path relative to this file.
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-    script_path = os.path.join(project_root, "booking_playwright_scraper.py")
-
-    if not os.path.isfile(script_path):
-        msg = f"Playwright scraper script not found at {script_path}"
-        print(f"[Booking Scraper] {msg}")
-        return {
-            "status": "error",
-            "message": msg,
-            "description": "No description found.",
-            "image_urls": [],
-            "booking_url": booking_url,
-        }
+    logger.debug("Calling tool: get_booking_com_data for %s", booking_url)
 
-    cmd = [sys.executable, script_path, booking_url, language]
     try:
-        completed = subprocess.run(
-            cmd,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300,
-        )
-    except subprocess.CalledProcessError as e:
-        msg = f"Playwright scraper failed: {e.stderr or e.stdout}"
-        print(f"[Booking Scraper] {msg}")
-        return {
-            "status": "error",
-            "message": msg,
-            "description": "No description found.",
-            "image_urls": [],
-            "booking_url": booking_url,
-        }
-    except subprocess.TimeoutExpired:
-        msg = "Playwright scraper timed out."
-        print(f"[Booking Scraper] {msg}")
-        return {
-            "status": "error",
-            "message": msg,
-            "description": "No description found.",
-            "image_urls": [],
-            "booking_url": booking_url,
-        }
-
-    stdout = (completed.stdout or "").strip()
-    try:
-        result = json.loads(stdout)
-    except json.JSONDecodeError as e:
-        msg = f"Could not parse scraper JSON output: {e}"
-        print(f"[Booking Scraper] {msg}")
-        print(f"[Booking Scraper] Raw output: {stdout[:200]}", file=sys.stderr)
+        result = await scrape_booking_hotel_async(booking_url, language)
+    except Exception as e:  # noqa: BLE001
+        msg = f"Playwright error while scraping: {e}"
+        logger.error("[Booking Scraper] %s", msg)
         return {
             "status": "error",
             "message": msg,
@@ -99,10 +76,11 @@ def get_booking_com_data(booking_url: str, language: str = "en") -> Dict[str, An
     if "booking_url" not in result:
         result["booking_url"] = booking_url
 
-    print(
-        f"--- [Booking Scraper] Result summary: status={result.get('status')}, "
-        f"desc_len={len(result.get('description', ''))}, "
-        f"images={len(result.get('image_urls', []))} ---"
+    logger.debug(
+        "[Booking Scraper] Result summary: status=%s, desc_len=%d, images=%d",
+        result.get("status"),
+        len(result.get("description", "")),
+        len(result.get("image_urls", [])),
     )
 
     return result
@@ -110,7 +88,262 @@ def get_booking_com_data(booking_url: str, language: str = "en") -> Dict[str, An
 
 # --- Google Cloud Vision Analyzer ---
 
-def analyze_image_with_vision(image_url: str) -> Dict[str, Any]:
+# One client per process: constructing ImageAnnotatorClient re-reads ADC
+# credentials and builds a fresh gRPC channel — hundreds of ms per call.
+# The channel is thread-safe, so a single instance serves every worker
+# thread; only creation needs the lock.
+_vision_client: Optional[vision.ImageAnnotatorClient] = None
+_vision_client_lock = threading.Lock()
+
+
+def _get_vision_client() -> vision.ImageAnnotatorClient:
+    global _vision_client
+    if _vision_client is None:
+        with _vision_client_lock:
+            if _vision_client is None:
+                _vision_client = vision.ImageAnnotatorClient()
+    return _vision_client
+
+
+# Cap on in-flight Vision requests so a 50-image gallery doesn't slam
+# the API (and our quota) all at once.
+_IMAGE_ANALYSIS_CONCURRENCY = int(os.getenv("IMAGE_ANALYSIS_CONCURRENCY", "8"))
+
+# batch_annotate_images accepts at most 16 images per request.
+_VISION_BATCH_SIZE = 16
+
+# The features we request for every image. TEXT_DETECTION is among the
+# more expensive Vision features and post-processing only ever kept
+# single OCR words — a weak signal for marketing captions — so it is
+# requested only when a caller explicitly asks for it.
+_VISION_FEATURES = [
+    {"type_": vision.Feature.Type.LABEL_DETECTION, "max_results": 10},
+    {"type_": vision.Feature.Type.OBJECT_LOCALIZATION, "max_results": 5},
+]
+_VISION_TEXT_FEATURE = {"type_": vision.Feature.Type.TEXT_DETECTION, "max_results": 5}
+
+
+def _vision_features(include_text: bool) -> List[Dict[str, Any]]:
+    if include_text:
+        return _VISION_FEATURES + [_VISION_TEXT_FEATURE]
+    return _VISION_FEATURES
+
+
+# Tags for a given URL + feature set are stable, so successful analyses
+# are cached and repeat runs skip the API call entirely. Errors are
+# never cached. The feature signature keys the cache so changing the
+# requested features invalidates old entries.
+_VISION_CACHE_TTL = 7 * 86400  # seconds
+
+if HAS_DISKCACHE:
+    _VISION_CACHE = diskcache.Cache(os.path.expanduser("~/.cache/booking_vision"))
+else:
+    _VISION_CACHE = {}
+
+
+def _vision_cache_key(image_url: str, include_text: bool) -> str:
+    sig = "labels10|objects5" + ("|text5" if include_text else "")
+    return hashlib.sha1(f"{image_url}|{sig}".encode()).hexdigest()
+
+
+def _vision_cache_get(image_url: str, include_text: bool) -> Optional[List[str]]:
+    try:
+        return _VISION_CACHE.get(_vision_cache_key(image_url, include_text))
+    except Exception:  # noqa: BLE001 - a broken cache must never fail a scrape
+        return None
+
+
+def _vision_cache_set(image_url: str, include_text: bool, tags: List[str]) -> None:
+    try:
+        key = _vision_cache_key(image_url, include_text)
+        if HAS_DISKCACHE:
+            _VISION_CACHE.set(key, tags, expire=_VISION_CACHE_TTL)
+        else:
+            _VISION_CACHE[key] = tags
+    except Exception:  # noqa: BLE001
+        pass
+
+
+# Optional prefetch: fetch image bytes ourselves, in parallel, and send
+# them inline to Vision instead of letting Vision fetch each URL on its
+# side. Worth enabling when the image origin is slow from Google's
+# egress path (or is our own CDN). Off by default.
+_VISION_PREFETCH_IMAGES = os.getenv("VISION_PREFETCH_IMAGES", "0") == "1"
+_VISION_INLINE_LIMIT = 10 * 1024 * 1024  # Vision rejects inline payloads over 10MB
+
+_fetch_session: Optional[requests.Session] = None
+_fetch_session_lock = threading.Lock()
+
+
+def _get_fetch_session() -> requests.Session:
+    """Pooled requests.Session so repeat fetches reuse keep-alive sockets."""
+    global _fetch_session
+    if _fetch_session is None:
+        with _fetch_session_lock:
+            if _fetch_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=16,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.5,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                    ),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _fetch_session = session
+    return _fetch_session
+
+
+def _fetch_image_bytes(url: str) -> Optional[bytes]:
+    """Fetch one image, or None to fall back to URI mode."""
+    try:
+        resp = _get_fetch_session().get(url, timeout=10)
+        resp.raise_for_status()
+        if len(resp.content) > _VISION_INLINE_LIMIT:
+            return None
+        return resp.content
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Image prefetch failed for %s (%s); using URI mode", url, e)
+        return None
+
+
+def _tags_from_response(response) -> List[str]:
+    """Collapse one image's label/object/text annotations into tags.
+
+    Dedup is case-insensitive (a `seen` set of lowercased keys), so
+    "Pool" from a label and "pool" from OCR collapse to one tag, and the
+    first (full-block) text annotation is skipped by index instead of
+    being added and discarded afterwards.
+    """
+    seen: set = set()
+    tags: List[str] = []
+
+    for label in response.label_annotations:
+        if label.score > 0.75 and label.description.lower() not in seen:  # Only confident labels
+            seen.add(label.description.lower())
+            tags.append(label.description)
+
+    for obj in response.localized_object_annotations:
+        if obj.score > 0.6 and obj.name.lower() not in seen:  # Only confident objects
+            seen.add(obj.name.lower())
+            tags.append(obj.name)
+
+    # The first text_annotation is the full block of text, subsequent
+    # ones are individual words — skip the block, keep single words.
+    for i, text in enumerate(response.text_annotations):
+        if i == 0:
+            continue
+        if ' ' not in text.description and text.description.lower() not in seen:
+            seen.add(text.description.lower())
+            tags.append(text.description)
+
+    return tags
+
+
+async def analyze_images_with_vision(
+    image_urls: List[str], include_text: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Analyzes a list of image URLs with the Vision API in batched RPCs.
+
+    Images are grouped into `batch_annotate_images` requests of up to 16
+    (the API maximum), so a full gallery costs a handful of round trips
+    instead of one per image. Batches run concurrently in worker threads,
+    bounded by a semaphore so we stay under provider rate limits.
+    Results preserve the input order; images whose analysis failed get an
+    empty tag list rather than being dropped.
+
+    Returns:
+        A list like:
+        [
+            {"image_url": "url1", "tags": ["Swimming Pool", "Palm Tree"]},
+            {"image_url": "url2", "tags": []}
+        ]
+    """
+    logger.debug("Calling tool: analyze_images_with_vision for %d images", len(image_urls))
+
+    # Serve repeat URLs from the cache; only the misses hit the API.
+    tags_by_url: Dict[str, List[str]] = {}
+    pending: List[str] = []
+    for url in dict.fromkeys(image_urls):
+        cached = _vision_cache_get(url, include_text)
+        if cached is not None:
+            tags_by_url[url] = cached
+        else:
+            pending.append(url)
+    if len(pending) < len(image_urls):
+        logger.debug(
+            "[Vision] Cache hits: %d/%d", len(image_urls) - len(pending), len(image_urls)
+        )
+
+    client = _get_vision_client()
+    sem = asyncio.Semaphore(_IMAGE_ANALYSIS_CONCURRENCY)
+
+    # Optionally pre-fetch bytes in parallel so Vision doesn't fetch the
+    # URLs serially on its side; any miss falls back to URI mode.
+    contents_by_url: Dict[str, bytes] = {}
+    if _VISION_PREFETCH_IMAGES and pending:
+        fetched = await asyncio.gather(
+            *(asyncio.to_thread(_fetch_image_bytes, url) for url in pending)
+        )
+        contents_by_url = {
+            url: content for url, content in zip(pending, fetched) if content
+        }
+
+    def _vision_image(url: str) -> vision.Image:
+        if url in contents_by_url:
+            return vision.Image(content=contents_by_url[url])
+        return vision.Image(source=vision.ImageSource(image_uri=url))
+
+    def _annotate_batch(batch: List[str]):
+        requests_ = [
+            vision.AnnotateImageRequest(
+                image=_vision_image(url),
+                features=_vision_features(include_text),
+            )
+            for url in batch
+        ]
+        return client.batch_annotate_images(requests=requests_)
+
+    async def _analyze_batch(batch: List[str]):
+        async with sem:
+            # The Vision client is synchronous (gRPC), so run it in a
+            # worker thread to keep the event loop free.
+            return await asyncio.to_thread(_annotate_batch, batch)
+
+    batches = [
+        pending[i : i + _VISION_BATCH_SIZE]
+        for i in range(0, len(pending), _VISION_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(
+        *(_analyze_batch(batch) for batch in batches),
+        return_exceptions=True,
+    )
+
+    for batch, result in zip(batches, results):
+        if isinstance(result, Exception):
+            logger.error("Error in Vision batch: %s", result)
+            for url in batch:
+                tags_by_url[url] = []
+            continue
+        for url, response in zip(batch, result.responses):
+            if response.error.message:
+                logger.warning("Vision error for %s: %s", url, response.error.message)
+                tags_by_url[url] = []
+            else:
+                tags = _tags_from_response(response)
+                tags_by_url[url] = tags
+                _vision_cache_set(url, include_text, tags)
+
+    return [
+        {"image_url": url, "tags": tags_by_url.get(url, [])} for url in image_urls
+    ]
+
+
+def analyze_image_with_vision(image_url: str, include_text: bool = False) -> Dict[str, Any]:
     """
     Uses the Google Cloud Vision API to analyze a single image URL and extract relevant marketing tags.
     It fetches labels, objects, and any detected text.
@@ -131,60 +364,38 @@ def analyze_image_with_vision(image_url: str) -> Dict[str, Any]:
             "message": "Vision API error."
         }
     """
-    print(f"--- Calling Tool: analyze_image_with_vision for {image_url} ---")
+    logger.debug("Calling tool: analyze_image_with_vision for %s", image_url)
+
+    cached = _vision_cache_get(image_url, include_text)
+    if cached:
+        return {"status": "success", "tags": cached}
+
     try:
-        # Instantiate a client
-        client = vision.ImageAnnotatorClient()
+        client = _get_vision_client()
 
         # Create the image object
         image = vision.Image()
         image.source.image_uri = image_url
 
-        # Define the features we want, as discussed
-        features = [
-            {"type_": vision.Feature.Type.LABEL_DETECTION, "max_results": 10},
-            {"type_": vision.Feature.Type.OBJECT_LOCALIZATION, "max_results": 5},
-            {"type_": vision.Feature.Type.TEXT_DETECTION, "max_results": 5},
-        ]
-
         # Perform the request
-        response = client.annotate_image({'image': image, 'features': features})
+        response = client.annotate_image(
+            {'image': image, 'features': _vision_features(include_text)}
+        )
 
         if response.error.message:
             raise Exception(response.error.message)
 
-        # Process the results into a single tag list
-        tags = set() # Use a set to avoid duplicate tags
-
-        # 1. Add Labels
-        for label in response.label_annotations:
-            if label.score > 0.75: # Only add confident labels
-                tags.add(label.description)
-
-        # 2. Add Objects
-        for obj in response.localized_object_annotations:
-            if obj.score > 0.6: # Only add confident objects
-                tags.add(obj.name)
-        
-        # 3. Add Text
-        for text in response.text_annotations:
-            # The first text_annotation is the full block of text, 
-            # subsequent ones are individual words. We'll skip the first.
-            if ' ' not in text.description: # A rough way to filter for single words/phrases
-                tags.add(text.description)
-        
-        # Remove the first, full-text annotation if it got added
-        if response.text_annotations:
-            tags.discard(response.text_annotations[0].description)
+        tags = _tags_from_response(response)
 
         if not tags:
             return {"status": "error", "message": "No relevant features found in the image."}
 
+        _vision_cache_set(image_url, include_text, tags)
         return {
             "status": "success",
-            "tags": list(tags)
+            "tags": tags
         }
 
     except Exception as e:
-        print(f"Error in Vision API: {e}")
+        logger.error("Error in Vision API: %s", e)
         return {"status": "error", "message": f"Error analyzing image: {e}"}
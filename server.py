@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 import logging
@@ -23,6 +24,11 @@ logger = logging.getLogger("api_server")
 # --- FastAPI App Setup ---
 app = FastAPI(title="Hospitality Agent API")
 
+# Cap in-flight pipeline runs: each one holds a browser page and a batch
+# of Vision/Gemini calls, so an unbounded burst of /generate requests
+# would head-of-line block everything behind it.
+_PIPELINE_SEM = asyncio.Semaphore(int(os.getenv("PIPELINE_CONCURRENCY", "8")))
+
 # Configure CORS to allow requests from the local Vite dev server
 # and from any future hosted frontend if needed.
 allowed_origins = [
@@ -72,10 +78,11 @@ async def generate_content(request: GenerateRequest):
     try:
         # Call the existing run_pipeline function from main.py
         # Note: run_pipeline is async, so we await it.
-        result = await run_pipeline(
-            booking_url=request.booking_url, 
-            website_url=request.website_url
-        )
+        async with _PIPELINE_SEM:
+            result = await run_pipeline(
+                booking_url=request.booking_url,
+                website_url=request.website_url
+            )
 
         if result.get("status") == "success":
             return GenerateResponse(
@@ -96,6 +103,21 @@ async def generate_content(request: GenerateRequest):
 
 if __name__ == "__main__":
     import uvicorn
+
+    # Multiple workers need the import-string form of the app, and
+    # reload is incompatible with workers > 1 — gate it for dev use.
+    workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+    reload = os.getenv("UVICORN_RELOAD", "0") == "1"
+
     print("Starting API Server...")
     print("Swagger Docs available at: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=1 if reload else workers,
+        reload=reload,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )